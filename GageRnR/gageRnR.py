@@ -1,6 +1,5 @@
 """Module containing the algorithm for GageRnR."""
 import numpy as np
-import math
 import scipy.stats as stats
 from tabulate import tabulate
 from .statistics import Statistics, Result, Component, MyComponent, \
@@ -16,6 +15,11 @@ ResultNames = {
     Result.P: 'P-value'
 }
 
+# Name and (result, component) cells of each row in GageRnR.summary()
+ResultCells = [
+    (ComponentNames[comp], [(key, comp) for key in ResultNames])
+    for comp in Component]
+
 MyResultNames = {
     Result.Variance: 'Var',
     Result.Std_results: 'Standar deviations',
@@ -29,6 +33,11 @@ MyResultNamesNoInteraction = {
 }
 
 
+def sumOfSquares(deviations):
+    """Sum the squared deviations without storing the squares."""
+    return np.vdot(deviations, deviations)
+
+
 class GageRnR(Statistics):
     """Main class for calculating GageRnR."""
 
@@ -45,141 +54,87 @@ class GageRnR(Statistics):
             n[i,j,k] where i = operator, j = part, k = measurement
         """
         super().__init__(data)
+        self._scratch = np.empty(self._data2d.shape)
 
     def summary(self, tableFormat="fancy_grid", precision='.3f'):
         """Convert result to tabular."""
-        if not hasattr(self, 'result'):
-            raise Exception(
-                'GageRnR.calculate() should be run before calling summary()')
-
-        headers = ['Sources of Variance']
-
-        for key in ResultNames:
-            headers.append(ResultNames[key])
+        return self.tabulateResults(
+            'Sources of Variance', ResultNames,
+            ((name, [self.result[key].get(comp) for key, comp in cells])
+             for name, cells in ResultCells),
+            tableFormat, precision)
 
-        table = []
-        for comp in Component:
-            innerTable = [ComponentNames[comp]]
-            for key in ResultNames:
-                if key not in (Result.Var, Result.Std):
-                    if comp in self.result[key]:
-                        innerTable.append(
-                            format(self.result[key][comp], precision))
-                    else:
-                        innerTable.append('')
-
-            table.append(innerTable)
-        return tabulate(
-            table,
-            headers=headers,
-            tablefmt=tableFormat)
-
-    # Mio
     def summary_2(self, tableFormat="fancy_grid", precision='.3f'):
-        """Convert result to tabular."""
-        if not hasattr(self, 'result'):
-            raise Exception(
-                'GageRnR.calculate() should be run before calling summary()')
-
-        headers = ['Std. Deviation']
+        """Convert variances considering interaction to tabular."""
+        return self.tabulateResults(
+            'Std. Deviation', MyResultNames,
+            ((MyComponentNames[comp], self.varianceTable[0, :, comp.value])
+             for comp in MyComponent),
+            tableFormat, precision)
 
-        for key in MyResultNames:
-            headers.append(MyResultNames[key])
-
-        table = []
-        for comp in MyComponent:
-            innerTable = [MyComponentNames[comp]]
-            for key in MyResultNames:
-                if comp in self.result[key]:
-                    innerTable.append(
-                        format(self.result[key][comp], precision))
-                else:
-                    innerTable.append('')
-
-            table.append(innerTable)
+    def summary_3(self, tableFormat="fancy_grid", precision='.3f'):
+        """Convert variances without interaction to tabular."""
+        return self.tabulateResults(
+            'Std. Deviation', MyResultNamesNoInteraction,
+            ((ComponentNamesNoInter[comp],
+              self.varianceTable[1, :, comp.value])
+             for comp in ComponentNoInter),
+            tableFormat, precision)
 
-        return tabulate(
-            table,
-            headers=headers,
-            tablefmt=tableFormat)
+    def summary_instruments(self, precision='.10f'):
+        """Convert variances considering interaction to a list of rows."""
+        return self.summary_2(tableFormat=None, precision=precision)
 
-    # Mio
+    def tabulateResults(self, title, resultNames, rows, tableFormat,
+                        precision):
+        """Format (name, values) rows below the result names.
 
-    def summary_3(self, tableFormat="fancy_grid", precision='.3f'):
-        """Convert result to tabular."""
+        Values that are None are left empty. If tableFormat is None the
+        formatted rows are returned without tabulating them.
+        """
         if not hasattr(self, 'result'):
             raise Exception(
                 'GageRnR.calculate() should be run before calling summary()')
 
-        headers = ['Std. Deviation']
-
-        for key in MyResultNamesNoInteraction:
-            headers.append(MyResultNamesNoInteraction[key])
-
         table = []
-        for comp in ComponentNoInter:
-            innerTable = [ComponentNamesNoInter[comp]]
-            for key in MyResultNamesNoInteraction:
-                if comp in self.result[key]:
-                    innerTable.append(
-                        format(self.result[key][comp], precision))
-                else:
-                    innerTable.append('')
+        for name, values in rows:
+            innerTable = [name]
+            for value in values:
+                innerTable.append(
+                    '' if value is None else format(value, precision))
 
             table.append(innerTable)
 
+        if tableFormat is None:
+            return table
+
         return tabulate(
             table,
-            headers=headers,
+            headers=[title] + list(resultNames.values()),
             tablefmt=tableFormat)
 
-# Mio per analisi dati strumenti di misur
-    def summary_instruments(self, precision='.10f'):
-        """Convert result to tabular."""
-        if not hasattr(self, 'result'):
-            raise Exception(
-                'GageRnR.calculate() should be run before calling summary()')
-
-        headers = ['Std. Deviation']
-
-        for key in MyResultNames:
-            headers.append(MyResultNames[key])
-
-        table = []
-        for comp in MyComponent:
-            innerTable = [MyComponentNames[comp]]
-            for key in MyResultNames:
-                if comp in self.result[key]:
-                    innerTable.append(
-                        format(self.result[key][comp], precision))
-                else:
-                    innerTable.append('')
-
-            table.append(innerTable)
-
-        return table
-
     def calculate(self):
         """Calculate GageRnR."""
         self.result = dict()
         self.result[Result.DF] = self.calculateDoF()
         self.result[Result.Mean] = self.calculateMean()
-        self.result[Result.SS] = self.calculateSS()
+        self.result[Result.SS] = self.calculateSS(self.result[Result.Mean])
 
         self.result[Result.MS] = self.calculateMS(
             self.result[Result.DF],
             self.result[Result.SS])
 
-        self.result[Result.Var],                                \
-            self.result[Result.Std_results],                        \
-            self.result[Result.Std_percentage],                     \
-            self.result[Result.Std_results_without_interaction],    \
-            self.result[Result.Std_percentage_without_interaction], \
-            self.result[Result.Variance],                           \
-            self.result[Result.Variance_no_inter],                  \
-            = self.calculateVar(self.result[Result.MS])
+        self.varianceTable = self.calculateVar(self.result[Result.MS])
 
-        self.result[Result.Std] = self.calculateStd(self.result[Result.Var])
+        for resultNames, components, values in (
+                (MyResultNames, MyComponent, self.varianceTable[0]),
+                (MyResultNamesNoInteraction, ComponentNoInter,
+                 self.varianceTable[1])):
+            for key, row in zip(resultNames, values):
+                self.result[key] = dict(zip(components, row))
+
+        self.result[Result.Var] = self.result[Result.Variance]
+        self.result[Result.Std] = self.result[Result.Std_results]
 
         self.result[Result.F] = self.calculateF(self.result[Result.MS])
 
@@ -204,59 +159,55 @@ class GageRnR(Statistics):
             Component.MEASUREMENT_WITHOUT_INTERACTION: eDof + opDoF,
             Component.TOTAL: totDof}
 
-    def calculateSquares(self):
-        """Calculate Squares."""
-        mean = self.calculateMean()
-        tS = (self.data - mean[Component.TOTAL])**2
-        oS = (mean[Component.OPERATOR] - mean[Component.TOTAL])**2
-        pS = (mean[Component.PART] - mean[Component.TOTAL])**2
-
-        dataE = self.data.reshape(
-            self.operators * self.parts,
-            self.measurements)
-        meanMeas = np.repeat(mean[Component.MEASUREMENT], self.measurements)
-        meanMeas = meanMeas.reshape(
-            self.operators * self.parts,
-            self.measurements)
-
-        mS = (dataE - meanMeas)**2
-        return {
-            Component.TOTAL: tS,
-            Component.OPERATOR: oS,
-            Component.PART: pS,
-            Component.MEASUREMENT: mS}
-
-    def calculateSumOfDeviations(self):
-        """Calculate Sum of Deviations."""
-        squares = self.calculateSquares()
-        SD = dict()
-        for key in squares:
-            SD[key] = np.sum(squares[key])
-        return SD
-
-    def calculateSS(self):
-        """Calculate Sum of Squares."""
-        SS = self.calculateSumOfDeviations()
-
-        SS[Component.OPERATOR] = \
-            self.parts * self.measurements * \
-            SS[Component.OPERATOR]
-
-        SS[Component.PART] = \
-            self.operators * self.measurements * \
-            SS[Component.PART]
+    def calculateSS(self, mean=None):
+        """Calculate Sum of Squares.
+
+        :param dict mean:
+            The result of calculateMean(), calculated if not given.
+        """
+        if mean is None:
+            mean = self.calculateMean()
+
+        mu = mean[Component.TOTAL]
+
+        meanMeas = mean[Component.MEASUREMENT].reshape(
+            self.operators * self.parts, 1)
+
+        # Each group mean is repeated over the measurements of its group,
+        # so the between-group sums are weighted by the group size.
+        SS = {
+            Component.OPERATOR:
+                self.parts * self.measurements *
+                sumOfSquares(mean[Component.OPERATOR] - mu),
+            Component.PART:
+                self.operators * self.measurements *
+                sumOfSquares(mean[Component.PART] - mu),
+            Component.MEASUREMENT: sumOfSquares(self.deviationsFromCells(meanMeas))}
+
+        cellSS = self.measurements * \
+            sumOfSquares(mean[Component.MEASUREMENT] - mu)
+
+        # The total splits into the spread within and between the
+        # operator-by-part cells, so the full data is only traversed once.
+        SS[Component.TOTAL] = SS[Component.MEASUREMENT] + cellSS
 
         SS[Component.OPERATOR_BY_PART] = \
-            SS[Component.TOTAL] - (
+            cellSS - (
                 SS[Component.OPERATOR] +
-                SS[Component.PART] +
-                SS[Component.MEASUREMENT])
+                SS[Component.PART])
 
         SS[Component.MEASUREMENT_WITHOUT_INTERACTION] = SS[Component.MEASUREMENT] + \
             SS[Component.OPERATOR_BY_PART]
 
         return SS
 
+    def deviationsFromCells(self, meanMeas):
+        """Subtract the cell means from the data into a reused buffer."""
+        if self._scratch.shape != self._data2d.shape:
+            self._scratch = np.empty(self._data2d.shape)
+
+        return np.subtract(self._data2d, meanMeas, out=self._scratch)
+
     def calculateMS(self, dof, SS):
         """Calculate Mean of Squares."""
         MS = dict()
@@ -269,178 +220,38 @@ class GageRnR(Statistics):
         return MS
 
     def calculateVar(self, MS):
-        """Calculate GageRnR Variances."""
-
-        # Variability considering intereaction between parts and operator
-        def check_pos(Var):
-            for key in Var:
-                if Var[key] < 0:
-                    Var[key] = 0
-        '''
-        Var = dict()
-    
-        Var[Component.MEASUREMENT] = MS[Component.MEASUREMENT]
-       
-        Var[Component.OPERATOR_BY_PART] = ((
-            MS[Component.OPERATOR_BY_PART] - MS[Component.MEASUREMENT]) /
-            self.parts)
-       
-        Var[Component.OPERATOR] = ((
-            MS[Component.OPERATOR] - MS[Component.OPERATOR_BY_PART]) /
-            (self.parts * self.measurements))
-
-        Var[Component.PART] = ((
-            MS[Component.PART] - MS[Component.OPERATOR_BY_PART]) /
-            (self.operators * self.measurements))
-
-        check_pos(Var)
-
-
-        Var[Component.TOTAL] = \
-            Var[Component.OPERATOR] + \
-            Var[Component.PART] + \
-            Var[Component.OPERATOR_BY_PART] + \
-            Var[Component.MEASUREMENT]
-
-        Var[GageRnR.GRR] = \
-            Var[Component.MEASUREMENT] + \
-            Var[Component.OPERATOR] + \
-            Var[Component.OPERATOR_BY_PART]
-        '''
-
-        # Considering interaction
-        MyVar = dict()
-
-        MyVar[MyComponent.EV] = MS[Component.MEASUREMENT]
-
-        MyVar[MyComponent.OPERATOR_BY_PART] = ((
-            MS[Component.OPERATOR_BY_PART] - MS[Component.MEASUREMENT]) /
-            self.parts)
-
-        MyVar[MyComponent.AV] = ((
-            MS[Component.OPERATOR] - MS[Component.OPERATOR_BY_PART]) /
-            (self.parts * self.measurements))
-
-        MyVar[MyComponent.PV] = ((
-            MS[Component.PART] - MS[Component.OPERATOR_BY_PART]) /
-            (self.operators * self.measurements))
-
-        check_pos(MyVar)
-
-        MyVar[MyComponent.TOTAL_VAR] = \
-            MyVar[MyComponent.AV] + \
-            MyVar[MyComponent.PV] + \
-            MyVar[MyComponent.OPERATOR_BY_PART] + \
-            MyVar[MyComponent.EV]
-
-        MyVar[MyComponent.GRR] = \
-            MyVar[MyComponent.EV] + \
-            MyVar[MyComponent.AV] + \
-            MyVar[MyComponent.OPERATOR_BY_PART]
-
-        MyStd = dict()
-        MyStd[MyComponent.GRR] = math.sqrt(MyVar[MyComponent.GRR])
-        MyStd[MyComponent.EV] = math.sqrt(MyVar[MyComponent.EV])
-        MyStd[MyComponent.AV] = math.sqrt(MyVar[MyComponent.AV])
-        MyStd[MyComponent.OPERATOR_BY_PART] = math.sqrt(
-            MyVar[MyComponent.OPERATOR_BY_PART])
-        MyStd[MyComponent.PV] = math.sqrt(MyVar[MyComponent.PV])
-        MyStd[MyComponent.TOTAL_VAR] = math.sqrt(MyVar[MyComponent.TOTAL_VAR])
-
-        MyStd_percent = dict()
-        MyStd_percent[MyComponent.GRR] = 100 * \
-            math.sqrt(MyVar[MyComponent.GRR] / MyVar[MyComponent.TOTAL_VAR])
-        MyStd_percent[MyComponent.EV] = 100 * \
-            math.sqrt(MyVar[MyComponent.EV] / MyVar[MyComponent.TOTAL_VAR])
-        MyStd_percent[MyComponent.AV] = 100 * \
-            math.sqrt(MyVar[MyComponent.AV] / MyVar[MyComponent.TOTAL_VAR])
-        MyStd_percent[MyComponent.OPERATOR_BY_PART] = 100 * \
-            math.sqrt(MyVar[MyComponent.OPERATOR_BY_PART] /
-                      MyVar[MyComponent.TOTAL_VAR])
-        MyStd_percent[MyComponent.PV] = 100 * \
-            math.sqrt(MyVar[MyComponent.PV] / MyVar[MyComponent.TOTAL_VAR])
-        MyStd_percent[MyComponent.TOTAL_VAR] = 100 * \
-            math.sqrt(MyVar[MyComponent.TOTAL_VAR] /
-                      MyVar[MyComponent.TOTAL_VAR])
-
-        # Without considering interaction
-        MyVar_no_inter = dict()
-
-        MyVar_no_inter[ComponentNoInter.EV_WITHOUT_INTERACTION] = MS[Component.MEASUREMENT_WITHOUT_INTERACTION]
-
-        MyVar_no_inter[ComponentNoInter.OPERATOR_BY_PART] = ((
-            MS[Component.OPERATOR_BY_PART] - MS[Component.MEASUREMENT_WITHOUT_INTERACTION]) /
-            self.parts)
-
-        MyVar_no_inter[ComponentNoInter.AV] = ((
-            MS[Component.OPERATOR] - MS[Component.OPERATOR_BY_PART]) /
-            (self.parts * self.measurements))
-
-        MyVar_no_inter[ComponentNoInter.PV] = ((
-            MS[Component.PART] - MS[Component.OPERATOR_BY_PART]) /
-            (self.operators * self.measurements))
-
-        check_pos(MyVar_no_inter)
-
-        MyVar_no_inter[ComponentNoInter.TOTAL_VAR] = \
-            MyVar_no_inter[ComponentNoInter.AV] + \
-            MyVar_no_inter[ComponentNoInter.PV] + \
-            MyVar_no_inter[ComponentNoInter.OPERATOR_BY_PART] + \
-            MyVar_no_inter[ComponentNoInter.EV_WITHOUT_INTERACTION]
-
-        MyVar_no_inter[ComponentNoInter.GRR_WITHOUT_INTERACTION] = \
-            MyVar_no_inter[ComponentNoInter.EV_WITHOUT_INTERACTION] + \
-            MyVar_no_inter[ComponentNoInter.AV] + \
-            MyVar_no_inter[ComponentNoInter.OPERATOR_BY_PART]
-
-        MyStd_no_interaction = dict()
-        MyStd_no_interaction[ComponentNoInter.EV_WITHOUT_INTERACTION] = math.sqrt(
-            MyVar_no_inter[ComponentNoInter.EV_WITHOUT_INTERACTION])
-        MyStd_no_interaction[ComponentNoInter.AV] = math.sqrt(
-            MyVar_no_inter[ComponentNoInter.AV])
-        MyStd_no_interaction[ComponentNoInter.OPERATOR_BY_PART] = math.sqrt(
-            MyVar_no_inter[ComponentNoInter.OPERATOR_BY_PART])
-        MyStd_no_interaction[ComponentNoInter.PV] = math.sqrt(
-            MyVar_no_inter[ComponentNoInter.PV])
-        MyStd_no_interaction[ComponentNoInter.GRR_WITHOUT_INTERACTION] = math.sqrt(
-            MyVar_no_inter[ComponentNoInter.GRR_WITHOUT_INTERACTION])
-        MyStd_no_interaction[ComponentNoInter.TOTAL_VAR] = math.sqrt(
-            MyVar_no_inter[ComponentNoInter.TOTAL_VAR])
-
-        MyStd_percent_no_interaction = dict()
-
-        MyStd_percent_no_interaction[ComponentNoInter.GRR_WITHOUT_INTERACTION] = 100 * \
-            math.sqrt(MyVar_no_inter[ComponentNoInter.GRR_WITHOUT_INTERACTION] /
-                      MyVar_no_inter[ComponentNoInter.TOTAL_VAR])
-
-        MyStd_percent_no_interaction[ComponentNoInter.EV_WITHOUT_INTERACTION] = 100 * \
-            math.sqrt(MyVar_no_inter[ComponentNoInter.EV_WITHOUT_INTERACTION] /
-                      MyVar_no_inter[ComponentNoInter.TOTAL_VAR])
-
-        MyStd_percent_no_interaction[ComponentNoInter.AV] = 100 * \
-            math.sqrt(MyVar_no_inter[ComponentNoInter.AV] /
-                      MyVar_no_inter[ComponentNoInter.TOTAL_VAR])
-
-        MyStd_percent_no_interaction[ComponentNoInter.OPERATOR_BY_PART] = 100 * \
-            math.sqrt(MyVar_no_inter[ComponentNoInter.OPERATOR_BY_PART] /
-                      MyVar_no_inter[ComponentNoInter.TOTAL_VAR])
-
-        MyStd_percent_no_interaction[ComponentNoInter.PV] = 100 * \
-            math.sqrt(MyVar_no_inter[ComponentNoInter.PV] /
-                      MyVar_no_inter[ComponentNoInter.TOTAL_VAR])
-
-        MyStd_percent_no_interaction[ComponentNoInter.TOTAL_VAR] = 100
-
-        return MyVar, MyStd, MyStd_percent, MyStd_no_interaction, \
-            MyStd_percent_no_interaction, MyVar, MyVar_no_inter
-
-    def calculateStd(self, Var):
-        """Calculate GageRnR Standard Deviations."""
-        Std = dict()
-        for key in Var:
-            Std[key] = math.sqrt(Var[key])
-
-        return Std
+        """Calculate GageRnR Variances.
+
+        Returns an array indexed as [model, result, component]. Model 0
+        considers the operator-part interaction and model 1 does not,
+        results are ordered as MyResultNames and components as MyComponent.
+        """
+        # Rows: considering interaction, without considering interaction.
+        # Columns: EV, AV, OPERATOR_BY_PART, PV. Only EV and
+        # OPERATOR_BY_PART depend on the model, AV and PV are shared.
+        repeatability = np.array([
+            MS[Component.MEASUREMENT],
+            MS[Component.MEASUREMENT_WITHOUT_INTERACTION]])
+
+        var = np.empty((2, 4))
+        var[:, 0] = repeatability
+        var[:, 1] = (
+            MS[Component.OPERATOR] - MS[Component.OPERATOR_BY_PART]) / \
+            (self.parts * self.measurements)
+        var[:, 2] = (MS[Component.OPERATOR_BY_PART] - repeatability) / \
+            self.parts
+        var[:, 3] = (
+            MS[Component.PART] - MS[Component.OPERATOR_BY_PART]) / \
+            (self.operators * self.measurements)
+
+        # Negative variance estimates are truncated to zero
+        np.maximum(var, 0, out=var)
+
+        var = np.column_stack((var[:, :3].sum(axis=1), var, var.sum(axis=1)))
+        std = np.sqrt(var)
+        percent = std * (100 / std[:, -1:])
+
+        return np.stack((var, std, percent), axis=1)
 
     def calculateF(self, MS):
         """Calculate F-Values."""
@@ -462,23 +273,16 @@ class GageRnR(Statistics):
 
     def calculateP(self, dof, F):
         """Calculate P-Values."""
-        P = dict()
-
-        P[Component.OPERATOR] = \
-            stats.f.sf(
-            F[Component.OPERATOR],
-            dof[Component.OPERATOR],
-            dof[Component.OPERATOR_BY_PART])
-
-        P[Component.PART] = \
-            stats.f.sf(
-            F[Component.PART],
-            dof[Component.PART],
-            dof[Component.OPERATOR_BY_PART])
-
-        P[Component.OPERATOR_BY_PART] = \
-            stats.f.sf(
-            F[Component.OPERATOR_BY_PART],
-            dof[Component.OPERATOR_BY_PART],
-            dof[Component.MEASUREMENT])
-        return P
+        components = [
+            Component.OPERATOR,
+            Component.PART,
+            Component.OPERATOR_BY_PART]
+
+        P = stats.f.sf(
+            [F[c] for c in components],
+            [dof[c] for c in components],
+            [dof[Component.OPERATOR_BY_PART],
+             dof[Component.OPERATOR_BY_PART],
+             dof[Component.MEASUREMENT]])
+
+        return dict(zip(components, P))
@@ -92,9 +92,6 @@ class Statistics(object):
 
     def __init__(self, data, labels=None):
         self.data = data
-        self.parts = data.shape[1]
-        self.operators = data.shape[0]
-        self.measurements = data.shape[2]
 
         if labels is None:
             self.labels = {}
@@ -108,6 +105,25 @@ class Statistics(object):
         if "Part" not in self.labels:
             self.labels["Part"] = [("Part %d" % x) for x in range(self.parts)]
 
+    @property
+    def data(self):
+        """Data structured as n[i,j,k], i = operator, j = part, k = measurement.
+
+        This is a view of the contiguous (operators * parts, measurements)
+        array the data is stored as.
+        """
+        return self._data2d.reshape(
+            self.operators,
+            self.parts,
+            self.measurements)
+
+    @data.setter
+    def data(self, data):
+        self.operators, self.parts, self.measurements = data.shape
+        self._data2d = np.ascontiguousarray(data).reshape(
+            self.operators * self.parts,
+            self.measurements)
+
     def __str__(self):
         """Enum containing the measurements calculated by Statistics."""
         if not hasattr(self, 'result'):
@@ -152,9 +168,10 @@ class Statistics(object):
 
     def createOperatorsBoxData(self):
         data = []
+        operators = self.dataToOperators()
         for i in range(0, self.operators):
             data.append(go.Box(
-                y=self.data[i, :, :].flatten(),
+                y=operators[i],
                 boxpoints='all',
                 name=self.labels["Operator"][i],
                 notched=True,
@@ -168,9 +185,10 @@ class Statistics(object):
 
     def createPartsBoxData(self):
         data = []
+        parts = self.dataToParts()
         for i in range(0, self.parts):
             data.append(go.Box(
-                y=self.data[:, i, :].flatten(),
+                y=parts[i],
                 boxpoints='all',
                 name=self.labels["Part"][i],
                 notched=True,
@@ -196,15 +214,16 @@ class Statistics(object):
 
     def calculateMean(self):
         """Calculate Mean."""
-        mu = np.array([np.mean(self.data)])
-
-        omu = np.mean(self.data, axis=1)
-        omu = np.mean(omu, axis=1)
+        # Only the cell means read the full data, the design is balanced
+        # so the other means can be derived from them.
+        emu = np.mean(self._data2d, axis=1).reshape(
+            self.operators,
+            self.parts)
 
-        pmu = np.mean(self.data, axis=0)
-        pmu = np.mean(pmu, axis=1)
+        mu = np.array([np.mean(emu)])
+        omu = np.mean(emu, axis=1)
+        pmu = np.mean(emu, axis=0)
 
-        emu = np.mean(self.data, axis=2)
         emu = emu.reshape(self.parts * self.operators)
 
         return {
@@ -241,6 +260,6 @@ class Statistics(object):
             self.measurements*self.operators)
 
     def dataToOperators(self):
-        return self.data.reshape(
+        return self._data2d.reshape(
             self.operators,
             self.measurements*self.parts)
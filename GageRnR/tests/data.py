@@ -26,20 +26,3 @@ linearityData = np.array(
          [5, 5, 5]],
         [[0, 0, 0],
          [0, 0, 0]]])
-
-squaresMeas = np.array([
-    [0.025, 0.001, 0.037],
-    [0.002, 0.005, 0.001],
-    [0.006, 0.008, 0.000],
-    [0.004, 0.001, 0.011],
-    [0.003, 0.004, 0.000],
-    [0.003, 0.014, 0.004],
-    [0.102, 0.185, 0.012],
-    [0.001, 0.047, 0.034],
-    [0.163, 0.380, 0.046],
-    [0.206, 0.035, 0.071],
-    [0.013, 0.001, 0.006],
-    [0.050, 0.001, 0.039],
-    [0.000, 0.044, 0.044],
-    [0.000, 0.003, 0.002],
-    [0.018, 0.066, 0.015]])
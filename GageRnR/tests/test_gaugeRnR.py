@@ -2,7 +2,8 @@
 """The GageRnR Tests."""
 import unittest
 from GageRnR import GageRnR, Component, Result
-from .data import data, squaresMeas
+from GageRnR.statistics import MyComponent, ComponentNoInter
+from .data import data
 import numpy as np
 
 
@@ -47,40 +48,6 @@ class TestGageRnR(unittest.TestCase):
              3.133, 2.210, 4.157, 3.413, 1.987,
              2.927, 1.843, 3.880, 3.150, 1.673], 3)
 
-    def test_calculateSquares(self):
-        """The GageRnR Tests."""
-        g = GageRnR(data)
-        squares = g.calculateSquares()
-
-        np.testing.assert_array_almost_equal(
-            squares[Component.OPERATOR],
-            [0.0453, 0.0013, 0.0621], 3)
-
-        np.testing.assert_array_almost_equal(
-            squares[Component.PART],
-            [0.0507, 0.6318, 1.3343, 0.1788, 1.0165], 3)
-
-        np.testing.assert_array_almost_equal(
-            squares[Component.MEASUREMENT],
-            squaresMeas, 3)
-
-    def test_calculateSumOfDeviations(self):
-        """The GageRnR Tests."""
-        g = GageRnR(data)
-        SD = g.calculateSumOfDeviations()
-
-        self.assertAlmostEqual(
-            SD[Component.TOTAL], 32.317, 3)
-
-        self.assertAlmostEqual(
-            SD[Component.OPERATOR], 0.1087, 3)
-
-        self.assertAlmostEqual(
-            SD[Component.PART], 3.2122, 3)
-
-        self.assertAlmostEqual(
-            SD[Component.MEASUREMENT], 1.712, 3)
-
     def test_calculateSS(self):
         """The GageRnR Tests."""
         g = GageRnR(data)
@@ -101,6 +68,19 @@ class TestGageRnR(unittest.TestCase):
         self.assertAlmostEqual(
             SS[Component.MEASUREMENT], 1.712, 3)
 
+    def test_calculateInPlaceUpdate(self):
+        """The GageRnR Tests."""
+        g = GageRnR(data.copy())
+        g.calculate()
+        g.data[0, 0, 0] += 10
+        SS = g.calculate()[Result.SS]
+
+        updated = data.copy()
+        updated[0, 0, 0] += 10
+        expected = GageRnR(updated).calculate()[Result.SS]
+        for key in expected:
+            self.assertAlmostEqual(SS[key], expected[key])
+
     def test_calculateMS(self):
         """The GageRnR Tests."""
         g = GageRnR(data)
@@ -133,6 +113,36 @@ class TestGageRnR(unittest.TestCase):
         self.assertAlmostEqual(
             Var[Component.MEASUREMENT], 0.057, 3)
 
+    def test_varianceTable(self):
+        """The GageRnR Tests."""
+        g = GageRnR(data)
+        g.calculate()
+
+        self.assertEqual(g.varianceTable.shape, (2, 3, 6))
+
+        var, std, percent = g.varianceTable[0]
+        np.testing.assert_array_almost_equal(
+            var[[MyComponent.GRR.value,
+                 MyComponent.EV.value,
+                 MyComponent.PV.value]],
+            [0.1109, 0.0571, 0.8021], 4)
+        np.testing.assert_array_almost_equal(
+            std[[MyComponent.GRR.value,
+                 MyComponent.EV.value,
+                 MyComponent.PV.value]],
+            [0.3330, 0.2389, 0.8956], 4)
+        self.assertAlmostEqual(
+            percent[MyComponent.GRR.value], 34.848, 3)
+
+        var, std, percent = g.varianceTable[1]
+        np.testing.assert_array_almost_equal(
+            var[[ComponentNoInter.GRR_WITHOUT_INTERACTION.value,
+                 ComponentNoInter.EV_WITHOUT_INTERACTION.value,
+                 ComponentNoInter.PV.value]],
+            [0.1006, 0.0468, 0.8021], 4)
+        self.assertAlmostEqual(
+            percent[ComponentNoInter.TOTAL_VAR.value], 100)
+
     def test_calculateF(self):
         """The GageRnR Tests."""
         g = GageRnR(data)
@@ -183,3 +193,28 @@ class TestGageRnR(unittest.TestCase):
         g.calculate()
         g.summary()
         self.assertTrue(True)
+
+    def test_summaryVariance(self):
+        """The GageRnR Tests."""
+        g = GageRnR(data)
+        self.assertRaises(Exception, g.summary_2)
+        g.calculate()
+        g.summary_2()
+        g.summary_3()
+
+        table = g.summary_instruments(precision='.1f')
+        self.assertEqual(len(table), 6)
+        self.assertEqual(table[-1], ['Total', '0.9', '1.0', '100.0'])
+
+    def test_calculateReshapedData(self):
+        """The GageRnR Tests."""
+        g = GageRnR(data)
+        g.calculate()
+
+        reshaped = data[:2, :, :2]
+        g.data = reshaped
+        SS = g.calculate()[Result.SS]
+
+        expected = GageRnR(reshaped).calculate()[Result.SS]
+        for key in expected:
+            self.assertAlmostEqual(SS[key], expected[key])
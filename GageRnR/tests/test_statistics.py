@@ -43,6 +43,19 @@ class TestStatistics(unittest.TestCase):
         self.assertAlmostEqual(meanOperator0, mean[Component.OPERATOR][0])
         self.assertAlmostEqual(meanPart0, mean[Component.PART][0])
 
+    def test_meanUpdatedData(self):
+        g = Statistics(data.copy())
+        g.calculateMean()
+        g.data[0, 0, 0] += 10
+        mean = g.calculateMean()
+        self.assertAlmostEqual(
+            np.mean(data[0, :, :]) + 10 / 15, mean[Component.OPERATOR][0])
+
+        g.data = data * 2
+        mean = g.calculateMean()
+        self.assertAlmostEqual(
+            2 * np.mean(data[0, :, :]), mean[Component.OPERATOR][0])
+
     def test_summaryRaise(self):
         g = Statistics(data)
         mean = g.calculateMean()